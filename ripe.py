@@ -35,333 +35,445 @@
 # -----------------------------------------------------------------------------
 
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from xml.sax.saxutils import XMLGenerator
 import argparse
-from netaddr import IPRange, cidr_merge
-import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 import json
 import sys
 import re
+import functools
+import hashlib
+import itertools
+from ripe_core import extract_entries, summarize_range
+
+# Optional C-accelerated JSON parser; fall back to the standard library
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 VERSION = "0.1"
 
+# Trailing hyphen and whitespace in inetnum values such as "10.0.0.0 - "
+_TRAILING_HYPHEN_RE = re.compile(r'\s*-\s*$')
+
+# Sort order for cursor pagination; Solr requires it to include the unique key.
+# Only sent while the server keeps returning cursors.
+CURSOR_SORT = "id asc"
+
+# Number of offset pages fetched concurrently (kept equal to the connection pool
+# size to stay within RIPE rate limits)
+MAX_WORKERS = 4
+
+# Shared session so paginated queries reuse the same keep-alive connection
+SESSION = requests.Session()
+SESSION.headers.update({
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": f"ripe-query/{VERSION}",
+})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MAX_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
 def about():
     print(f"""Ripe API Query Tool - v{VERSION}""")
 
-def query_ripe_api(base_url, query, start=0, rows=10):
+def query_ripe_api(session, base_url, query, start=0, rows=10, fl=None, cursor_mark=None):
     """
     Query the RIPE API with the specified query parameters.
+    :param session: requests.Session used for the request.
     :param base_url: Base URL for the RIPE API.
     :param query: Query string.
-    :param start: Starting index for the results.
+    :param start: Starting index for the results (ignored when cursor_mark is set).
     :param rows: Number of results to fetch per page.
-    :return: Parsed XML or JSON response.
+    :param fl: Optional list of fields Solr should return. If None, return all fields.
+    :param cursor_mark: Optional Solr cursor to continue from ("*" for the first page).
+                        If None, offset pagination with start is used.
+    :return: Parsed JSON response.
     """
-    # Automatically escape the query
-    escaped_query = urllib.parse.quote_plus(query)
-    url = f"{base_url}?facet=true&format=xml&hl=true&q={escaped_query}&start={start}&rows={rows}&wt=json"
+    params = {
+        "q": query,
+        "rows": rows,
+        "wt": "json",
+    }
+    if cursor_mark is None:
+        params["start"] = start
+    else:
+        params["sort"] = CURSOR_SORT
+        params["cursorMark"] = cursor_mark
+    if fl:
+        params["fl"] = ",".join(fl)
     try:
-        response = requests.get(url)
+        response = session.get(base_url, params=params, timeout=(5, 30))
         response.raise_for_status()  # Raise an exception for HTTP errors
         
         content_type = response.headers.get('Content-Type', '')
         
         if 'application/json' in content_type:
-            return response.json()
-        elif 'application/xml' in content_type or 'text/xml' in content_type:
-            return ET.fromstring(response.text)  # Parse XML
+            return json_loads(response.content)
         else:
-            print(f"Unexpected content type: {content_type}")
-            print(f"Response text: {response.text}")
+            print(f"Unexpected content type: {content_type}", file=sys.stderr)
+            print(f"Response text: {response.text}", file=sys.stderr)
             return None
-    except requests.exceptions.RequestException as e:
-        print(f"Request failed: {e}")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        # ValueError covers malformed bodies from both json and orjson
+        print(f"Request failed: {e}", file=sys.stderr)
         return None
 
-def extract_fields_from_xml(xml_response, filters):
-    """
-    Extract specified fields from the XML API response.
-    :param xml_response: Parsed XML response.
-    :param filters: List of fields to extract. If None, extract all fields.
-    :return: List of dictionaries containing the extracted fields.
-    """
-    extracted_data = []
-    for doc in xml_response.findall(".//doc"):
-        entry = {}
-        for field in doc.findall(".//str"):
-            field_name = field.attrib.get("name")
-            if field_name:
-                if field_name.lower() == "inetnum":
-                    # Map 'inetnum' to 'inetnum' to maintain consistency
-                    entry["inetnum"] = field.text.strip()
-                elif not filters or field_name.lower() in filters:
-                    entry[field_name.lower()] = field.text.strip()
-        if filters:
-            # Ensure all filter fields are present; set to empty string if missing
-            for f in filters:
-                if f not in entry:
-                    entry[f] = ""
-        extracted_data.append(entry)
-    return extracted_data
-
 def extract_fields_from_json(json_response, filters):
     """
     Extract specified fields from the JSON API response.
+    Missing filter fields are left out; prepare_targets fills them with empty strings.
     :param json_response: Parsed JSON response.
     :param filters: List of fields to extract. If None, extract all fields.
-    :return: List of dictionaries containing the extracted fields.
+    :return: Iterator of dictionaries containing the extracted fields.
     """
-    extracted_data = []
     docs = json_response.get('result', {}).get('docs', [])
-    for doc in docs:
-        entry = {}
-        for field in doc.get("strs", []):
-            field_name = field.get("name")
-            field_value = field.get("value")
-            if field_name and field_value:
-                if field_name.lower() == "inetnum":
-                    # Map 'inetnum' to 'inetnum' to maintain consistency
-                    entry["inetnum"] = field_value.strip()
-                elif not filters or field_name.lower() in filters:
-                    entry[field_name.lower()] = field_value.strip()
-        if filters:
-            # Ensure all filter fields are present; set to empty string if missing
-            for f in filters:
-                if f not in entry:
-                    entry[f] = ""
-        extracted_data.append(entry)
-    return extracted_data
+    # 'inetnum' is always kept, other fields only if requested; None accepts all
+    accepted = set(filters) | {"inetnum"} if filters else None
+    return extract_entries(docs, accepted)
 
 def convert_to_cidr(inetnum):
     """
     Convert an IP range to CIDR blocks.
+    Results are cached, since the same inetnum often repeats across RIPE results.
     :param inetnum: IP range in "start - end" format.
-    :return: List of CIDR blocks.
+    :return: Tuple of CIDR blocks.
     """
+    # Strip before the cache lookup so whitespace variants share one entry
+    return _convert_to_cidr_cached(inetnum.strip())
+
+@functools.lru_cache(maxsize=4096)
+def _convert_to_cidr_cached(inetnum):
     try:
         # Remove any trailing hyphens and spaces
-        inetnum_clean = re.sub(r'\s*-\s*$', '', inetnum)
-        start_ip, end_ip = inetnum_clean.split(' - ')
-        ip_range_obj = IPRange(start_ip.strip(), end_ip.strip())
-        cidr_blocks = cidr_merge(ip_range_obj)  # Merge into smallest CIDR blocks
-        return [str(block) for block in cidr_blocks]
+        inetnum_clean = _TRAILING_HYPHEN_RE.sub('', inetnum)
+        start_ip, _, end_ip = inetnum_clean.partition(' - ')
+        return summarize_range(start_ip.strip(), end_ip.strip())
     except Exception as e:
-        print(f"Error converting inetnum '{inetnum}' to CIDR: {e}")
-        return [inetnum]  # Fallback to original range
+        print(f"Error converting inetnum '{inetnum}' to CIDR: {e}", file=sys.stderr)
+        return (inetnum,)  # Fallback to original range
+
+def _row_key(row):
+    """
+    Build a compact deduplication key for a row.
+    :param row: List of row values.
+    :return: 16-byte digest of the row values.
+    """
+    return hashlib.blake2b(b"\0".join(value.encode() for value in row), digest_size=16).digest()
+
+def _collect_columns(extracted_entries):
+    """
+    Collects entries column by column instead of keeping one dictionary per entry.
+    :param extracted_entries: Iterable of dictionaries containing the extracted fields.
+    :return: Dictionary mapping each field to its list of values, one per entry.
+    """
+    columns = {}
+    count = 0
+    for entry in extracted_entries:
+        for field, value in entry.items():
+            column = columns.get(field)
+            if column is None:
+                # Field seen for the first time; earlier entries did not have it
+                column = columns[field] = [""] * count
+            column.append(value)
+        count += 1
+        # Pad the fields this entry did not have
+        for column in columns.values():
+            if len(column) < count:
+                column.append("")
+    return columns
 
 def prepare_targets(extracted_entries, filters, cidr_flag, unique_flag):
     """
     Prepares the target data based on filters, CIDR conversion, and deduplication.
-    :param extracted_entries: List of dictionaries containing the extracted fields.
+    Rows are produced lazily, so only one entry is held at a time when filters are set.
+    :param extracted_entries: Iterable of dictionaries containing the extracted fields.
     :param filters: List of fields to include in the output.
     :param cidr_flag: Boolean indicating if CIDR conversion is requested.
     :param unique_flag: Boolean indicating if duplicates should be removed.
-    :return: Tuple containing headers and list of row lists.
+    :return: Tuple containing headers and an iterator of row lists.
     """
-    targets = []
-    seen = set()  # For deduplication
-
     if filters:
         headers = filters.copy()
-        for entry in extracted_entries:
-            # Check if all filter fields are empty; skip if so
-            if all(not entry.get(field, "") for field in filters):
-                continue
-            row = []
-            for field in filters:
-                value = entry.get(field, "")
-                if field == "inetnum" and cidr_flag and value:
-                    cidrs = convert_to_cidr(value)
-                    value = ','.join(cidrs)
-                row.append(value)
-            # Skip rows with all empty values
-            if any(row):
-                row_tuple = tuple(row)
-                if unique_flag:
-                    if row_tuple in seen:
-                        continue
-                    seen.add(row_tuple)
-                targets.append(row)
+        rows = ([entry.get(field, "") for field in headers] for entry in extracted_entries)
     else:
-        # No filters; extract all fields
-        headers = sorted({key for entry in extracted_entries for key in entry.keys()})
-        for entry in extracted_entries:
-            row = []
-            for field in headers:
-                value = entry.get(field, "")
-                if field == "inetnum" and cidr_flag and value:
-                    cidrs = convert_to_cidr(value)
-                    value = ','.join(cidrs)
-                row.append(value)
-            if any(row):
-                row_tuple = tuple(row)
-                if unique_flag:
-                    if row_tuple in seen:
-                        continue
-                    seen.add(row_tuple)
-                targets.append(row)
-    return headers, targets
-
-def print_table(headers, rows):
+        # No filters; the headers depend on every entry, so collect them first
+        columns = _collect_columns(extracted_entries)
+        headers = sorted(columns)
+        rows = (list(values) for values in zip(*[columns[header] for header in headers]))
+    return headers, _iter_rows(rows, headers, cidr_flag, unique_flag)
+
+def _iter_rows(rows, headers, cidr_flag, unique_flag):
+    """
+    Applies CIDR conversion and deduplication to the rows for prepare_targets.
+    :param rows: Iterable of row lists, in header order.
+    :param headers: List of fields making up each row.
+    :param cidr_flag: Boolean indicating if CIDR conversion is requested.
+    :param unique_flag: Boolean indicating if duplicates should be removed.
+    :return: Iterator of row lists.
+    """
+    seen = set()  # Row digests for deduplication
+
+    # Columns to convert to CIDR, looked up once instead of per cell
+    cidr_col_indices = [i for i, header in enumerate(headers) if header == "inetnum"] if cidr_flag else ()
+
+    for row in rows:
+        # Skip rows with all empty values
+        if not any(row):
+            continue
+        for i in cidr_col_indices:
+            if row[i]:
+                # Repeated inetnums are served from convert_to_cidr's LRU cache
+                row[i] = ','.join(convert_to_cidr(row[i]))
+        if unique_flag:
+            key = _row_key(row)
+            if key in seen:
+                continue
+            seen.add(key)
+        yield row
+
+def print_table(headers, rows, out=None):
     """
     Prints a table with headers and rows.
     :param headers: List of header strings.
-    :param rows: List of row lists.
+    :param rows: Iterable of row lists.
+    :param out: File object to write to (default: sys.stdout).
     """
+    out = out or sys.stdout
     if not headers:
-        print("No data to display.")
+        print("No data to display.", file=out)
         return
 
-    # Calculate the maximum width for each column
-    column_widths = [len(header) for header in headers]
+    # Column widths depend on every row, so the rows are collected first
+    rows = list(rows)
+
+    # Calculate the maximum width for each column in a single pass over the rows
+    column_widths = list(map(len, headers))
     for row in rows:
-        for i, cell in enumerate(row):
-            column_widths[i] = max(column_widths[i], len(str(cell)))
+        column_widths = [w if w >= len(cell) else len(cell) for w, cell in zip(column_widths, row)]
 
-    # Create format string
-    row_format = ' | '.join(['{{:<{}}}'.format(w) for w in column_widths])
+    # Create format string, including the line ending
+    row_format = ' | '.join(['{{:<{}}}'.format(w) for w in column_widths]) + '\n'
 
-    # Print header
-    print(row_format.format(*headers))
-    # Print separator
-    print('-+-'.join(['-' * w for w in column_widths]))
-    # Print rows
+    # Write header
+    out.write(row_format.format(*headers))
+    # Write separator
+    out.write('-+-'.join(['-' * w for w in column_widths]) + '\n')
+    # Write rows
+    write = out.write
     for row in rows:
-        print(row_format.format(*row))
+        write(row_format.format(*row))
 
-def print_grepable(headers, rows, separator):
+def print_grepable(headers, rows, separator, out=None):
     """
     Prints the results in a grepable format with specified separator.
     :param headers: List of header strings.
-    :param rows: List of row lists.
+    :param rows: Iterable of row lists.
     :param separator: Separator string for fields.
+    :param out: File object to write to (default: sys.stdout).
     """
+    out = out or sys.stdout
     if not headers:
-        print("No data to display.")
+        print("No data to display.", file=out)
         return
 
     # Print headers
-    print(separator.join(headers))
+    print(separator.join(headers), file=out)
     # Print rows
     for row in rows:
-        print(separator.join(row))
+        print(separator.join(row), file=out)
 
-def print_list(headers, rows, use_separators, separator):
+def print_list(headers, rows, use_separators, separator, out=None):
+    out = out or sys.stdout
     if use_separators:
         # Traditional list format with 'Parameter: value' and separators
         separator_line = '-' * 30
+        has_rows = False
         for row in rows:
-            print(separator_line)
+            has_rows = True
+            print(separator_line, file=out)
             for header, value in zip(headers, row):
                 if value:  # Only print if value is not empty
-                    print(f"{header}: {value}")
-        if rows:
-            print(separator_line)
+                    print(f"{header}: {value}", file=out)
+        if has_rows:
+            print(separator_line, file=out)
     else:
         # Plain output with values separated by the specified separator
         for row in rows:
             # Retain all fields, including empty ones
-            print(separator.join(row))
-
+            print(separator.join(row), file=out)
 
-def output_results(headers, rows, output_type, output_file, table_flag, grepable_flag, separator, list_flag, filter_set):
+def write_results(out, headers, rows, output_type, table_flag, grepable_flag, separator, list_flag, filter_set):
     """
-    Outputs the results in the specified format.
+    Writes the results in the specified format directly to a file object.
+    :param out: File object to write to.
     :param headers: List of header strings.
-    :param rows: List of row lists.
+    :param rows: Iterable of row lists.
     :param output_type: Type of output ('plain', 'json', 'xml').
-    :param output_file: File path to write the output.
     :param table_flag: Boolean indicating if table format is requested.
     :param grepable_flag: Boolean indicating if grepable format is requested.
     :param separator: Separator string for grepable and plain formats.
     :param list_flag: Boolean indicating if list format is requested.
     :param filter_set: Boolean indicating if a filter was set.
     """
-    output_data = ""
-
     if output_type == "plain":
-        if table_flag:
+        if not (table_flag or grepable_flag or list_flag):
+            print("No output format selected.", file=out)
+        elif not headers:
+            print("No data to display.", file=out)
+        elif table_flag:
             # Output as table
-            if not headers:
-                output_data = "No data to display."
-            else:
-                from io import StringIO
-                import sys
-
-                # Capture the table output
-                output = StringIO()
-                original_stdout = sys.stdout
-                sys.stdout = output
-                print_table(headers, rows)
-                sys.stdout = original_stdout
-                output_data = output.getvalue()
+            print_table(headers, rows, out=out)
         elif grepable_flag:
             # Output in grepable format
-            if not headers:
-                output_data = "No data to display."
-            else:
-                from io import StringIO
-                import sys
-
-                # Capture the grepable output
-                output = StringIO()
-                original_stdout = sys.stdout
-                sys.stdout = output
-                print_grepable(headers, rows, separator)
-                sys.stdout = original_stdout
-                output_data = output.getvalue()
-        elif list_flag:
-            # Output in list format
-            if not headers:
-                output_data = "No data to display."
-            else:
-                from io import StringIO
-                import sys
-
-                # Capture the list output
-                output = StringIO()
-                original_stdout = sys.stdout
-                sys.stdout = output
-                print_list(headers, rows, not filter_set, separator)
-                sys.stdout = original_stdout
-                output_data = output.getvalue()
+            print_grepable(headers, rows, separator, out=out)
         else:
-            output_data = "No output format selected."
+            # Output in list format
+            print_list(headers, rows, not filter_set, separator, out=out)
     elif output_type == "json":
-        if len(headers) > 1:
-            # Convert rows to list of dicts
-            data = [dict(zip(headers, row)) for row in rows]
-        elif len(headers) == 1:
-            # Convert rows to list of values
-            data = [row[0] for row in rows]
-        else:
-            data = []
-        output_data = json.dumps(data, indent=2)
-    elif output_type == "xml":
-        root = ET.Element("Targets")
+        # Write one array item at a time, laid out like json.dump(..., indent=2)
+        out.write("[")
+        first = True
         for row in rows:
-            target_elem = ET.SubElement(root, "Target")
             if len(headers) > 1:
-                for header, value in zip(headers, row):
-                    field_elem = ET.SubElement(target_elem, header)
-                    field_elem.text = value
+                # Rows become objects keyed by header
+                item = dict(zip(headers, row))
             elif len(headers) == 1:
-                field_elem = ET.SubElement(target_elem, headers[0])
-                field_elem.text = row[0]
-        output_data = ET.tostring(root, encoding='unicode')
-    else:
+                # Rows become plain values
+                item = row[0]
+            else:
+                continue
+            out.write("\n" if first else ",\n")
+            out.write("  " + json.dumps(item, indent=2).replace("\n", "\n  "))
+            first = False
+        out.write("]\n" if first else "\n]\n")
+    elif output_type == "xml":
+        # Emit elements as they are produced instead of building a tree
+        gen = XMLGenerator(out, encoding='utf-8', short_empty_elements=True)
+        gen.startElement("Targets", {})
+        for row in rows:
+            gen.startElement("Target", {})
+            for header, value in zip(headers, row):
+                gen.startElement(header, {})
+                gen.characters(value)
+                gen.endElement(header)
+            gen.endElement("Target")
+        gen.endElement("Targets")
+        out.write("\n")
+
+def output_results(headers, rows, output_type, output_file, table_flag, grepable_flag, separator, list_flag, filter_set):
+    """
+    Outputs the results in the specified format.
+    Results are written straight to the file or stdout without buffering them first.
+    :param headers: List of header strings.
+    :param rows: Iterable of row lists.
+    :param output_type: Type of output ('plain', 'json', 'xml').
+    :param output_file: File path to write the output.
+    :param table_flag: Boolean indicating if table format is requested.
+    :param grepable_flag: Boolean indicating if grepable format is requested.
+    :param separator: Separator string for grepable and plain formats.
+    :param list_flag: Boolean indicating if list format is requested.
+    :param filter_set: Boolean indicating if a filter was set.
+    """
+    if output_type not in ("plain", "json", "xml"):
         print(f"Unsupported output type: {output_type}")
         return
 
     if output_file:
         try:
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(output_data)
+                write_results(f, headers, rows, output_type, table_flag, grepable_flag, separator, list_flag, filter_set)
             print(f"Output written to {output_file}")
-        except Exception as e:
+        except OSError as e:
             print(f"Failed to write to file {output_file}: {e}")
     else:
-        print(output_data)
+        write_results(sys.stdout, headers, rows, output_type, table_flag, grepable_flag, separator, list_flag, filter_set)
+
+def fetch_entries(session, base_url, query, filters, rows_per_page=100):
+    """
+    Fetch all results for a query and yield the extracted entries page by page.
+    Pages are requested with Solr cursors, which keeps deep pages as cheap as the first one.
+    If the server does not return a cursor, offset pages are fetched concurrently instead.
+    Entries are consumed while the output is written, so diagnostics go to stderr.
+    :param session: requests.Session used for the requests.
+    :param base_url: Base URL for the RIPE API.
+    :param query: Query string.
+    :param filters: List of fields to extract. If None, extract all fields.
+    :param rows_per_page: Number of results per page.
+    :return: Iterator of dictionaries containing the extracted fields.
+    """
+    # Only ask Solr for the filtered fields; 'inetnum' is always extracted
+    fl = filters + [f for f in ["inetnum"] if f not in filters] if filters else None
+
+    # Fetch one page and extract all of its entries, so a malformed page is skipped
+    # as a whole; returns (None, None) if the page failed
+    def fetch_page(start=0, cursor_mark=None):
+        response = query_ripe_api(session, base_url, query, start=start, rows=rows_per_page, fl=fl, cursor_mark=cursor_mark)
+        if response is None:
+            return None, None
+        try:
+            return response, list(extract_fields_from_json(response, filters))
+        except (AttributeError, TypeError) as e:
+            print(f"Unexpected response structure: {e}", file=sys.stderr)
+            return None, None
+
+    cursor_mark = "*"
+    response, entries = fetch_page(cursor_mark=cursor_mark)
+    next_cursor_mark = response.get('nextCursorMark') if response is not None else None
+    if not next_cursor_mark:
+        # The cursor request was rejected or ignored; start over with offset pages,
+        # since the first page may have been ordered by the cursor sort
+        response, entries = fetch_page(start=0)
+    if response is None:
+        print("Failed to retrieve initial response.", file=sys.stderr)
+        sys.exit(1)
+
+    total_results = response.get('result', {}).get('numFound', 0)
+    print(f"Total results found: {total_results}")
+
+    fetched = 0
+    if next_cursor_mark:
+        while True:
+            fetched += len(entries)
+            yield from entries
+
+            # Stop once everything arrived, a page comes back empty or the cursor no longer advances
+            if fetched >= total_results or not entries or not next_cursor_mark or next_cursor_mark == cursor_mark:
+                break
+            cursor_mark = next_cursor_mark
+            response, entries = fetch_page(cursor_mark=cursor_mark)
+            if response is None:
+                # Later pages depend on this cursor, so none of them can be fetched
+                print(f"Failed to fetch results for cursorMark={cursor_mark}.", file=sys.stderr)
+                break
+            next_cursor_mark = response.get('nextCursorMark')
+    else:
+        fetched += len(entries)
+        yield from entries
+
+        # Remaining offset pages are independent, so fetch them concurrently
+        def fetch_offset_page(start):
+            return start, fetch_page(start=start)[1]
+
+        starts = range(rows_per_page, total_results, rows_per_page)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # executor.map yields in submission order, so entries keep their page order
+            for start, page_entries in executor.map(fetch_offset_page, starts):
+                if page_entries is None:
+                    print(f"Failed to fetch results for start={start}.", file=sys.stderr)
+                    continue
+                fetched += len(page_entries)
+                yield from page_entries
+
+    if fetched < total_results:
+        print(f"Warning: only {fetched} of {total_results} results were fetched; the output is incomplete.", file=sys.stderr)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -468,55 +580,16 @@ Examples:
     base_url = "https://apps.db.ripe.net/db-web-ui/api/rest/fulltextsearch/select"
     query = f'"{args.query}"'
     
-    # Initial query to get the total number of results
-    initial_response = query_ripe_api(base_url, query, start=0, rows=1)
-    if not initial_response:
-        print("Failed to retrieve initial response.")
-        sys.exit(1)
-
-    if isinstance(initial_response, ET.Element):
-        # Handle XML response
-        total_results = int(initial_response.find(".//result").attrib.get("numFound", 0))
-    elif isinstance(initial_response, dict):
-        # Handle JSON response (fallback)
-        total_results = initial_response.get('result', {}).get('numFound', 0)
-    else:
-        print("Unexpected response format.")
-        sys.exit(1)
-
-    print(f"Total results found: {total_results}")
-    
-    all_extracted_entries = []
-    rows_per_page = 100  # Number of results per page (adjust as needed)
-    
-    # Paginate through results
-    for start in range(0, total_results, rows_per_page):
-        print(f"Fetching results starting from {start}...")
-        response = query_ripe_api(base_url, query, start=start, rows=rows_per_page)
-        
-        if not response:
-            print(f"Failed to fetch results for start={start}.")
-            continue
-
-        if isinstance(response, ET.Element):
-            # Extract fields from XML
-            extracted_entries = extract_fields_from_xml(response, filters)
-        elif isinstance(response, dict):
-            # Extract fields from JSON
-            extracted_entries = extract_fields_from_json(response, filters)
-        else:
-            print("Unexpected response format during pagination.")
-            continue
-        
-        all_extracted_entries.extend(extracted_entries)
-    
-    if not all_extracted_entries:
+    # Entries are fetched page by page while the output is written
+    entries = fetch_entries(SESSION, base_url, query, filters)
+    first_entry = next(entries, None)
+    if first_entry is None:
         print("No data extracted.")
         sys.exit(0)
-    
+
     # Prepare targets based on filters, CIDR flag, and uniqueness
-    headers, targets = prepare_targets(all_extracted_entries, filters, args.cidr, args.unique)
-    
+    headers, targets = prepare_targets(itertools.chain([first_entry], entries), filters, args.cidr, args.unique)
+
     # Determine output mode
     table_flag = args.table
     grepable_flag = args.grepable
@@ -0,0 +1,38 @@
+# -----------------------------------------------------------------------------
+# Author: Sebastian Michel
+# Company: Rootsektor IT-Security GmbH
+# License: MIT License (see ripe.py and LICENSE)
+#
+# CPU-bound helpers used by ripe.py. This module only depends on the standard
+# library, so it can be run and JIT-compiled by PyPy without loading the CLI.
+# -----------------------------------------------------------------------------
+
+from ipaddress import ip_address, summarize_address_range
+
+def extract_entries(docs, accepted):
+    """
+    Extract fields from the docs of a Solr JSON response.
+    :param docs: List of docs from the JSON response.
+    :param accepted: Set of lowercase field names to keep. If None, keep all fields.
+    :return: Iterator of dictionaries containing the extracted fields.
+    """
+    for doc in docs:
+        entry = {}
+        for field in doc.get("strs", ()):
+            field_name = field.get("name")
+            field_value = field.get("value")
+            if field_name and field_value:
+                name_l = field_name.lower()
+                if accepted is None or name_l in accepted:
+                    entry[name_l] = field_value.strip()
+        yield entry
+
+def summarize_range(start_ip, end_ip):
+    """
+    Summarize an IP range into the smallest set of CIDR blocks.
+    The blocks are computed from the range bounds without enumerating addresses.
+    :param start_ip: First address of the range.
+    :param end_ip: Last address of the range.
+    :return: Tuple of CIDR blocks.
+    """
+    return tuple(str(block) for block in summarize_address_range(ip_address(start_ip), ip_address(end_ip)))